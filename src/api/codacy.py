@@ -1,17 +1,68 @@
 """Codacy API client for managing coding standards."""
-import requests
-import time
-from typing import Dict, List
+import asyncio
+import math
+import random
+import httpx
+import orjson
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, List, Mapping, Optional, Tuple, Union
 from src.config.settings import settings
+from src.utils.cache import DiskCache
 from src.utils.logger import get_logger
+from src.utils.rate_limiter import RateLimiter
 
 logger = get_logger()
 
+# Connection pool size shared by all requests to the Codacy API
+POOL_SIZE = 32
+
+# Retry policy for transient failures (exponential backoff with jitter)
+MAX_RETRIES = 3
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+BACKOFF_JITTER = 0.5
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Maximum number of characters of an error response body written to the log
+MAX_LOGGED_BODY = 1024
+
+# Languages enabled in every coding standard created by this tool
+ALL_LANGUAGES = (
+    "Markdown", "YAML", "JSON", "Python", "Dockerfile", "Shell", "XML", 
+    "Javascript", "HTML", "CSS", "Java", "C", "CPP", "TypeScript", "Powershell", 
+    "CSharp", "SQL", "SASS", "Swift", "Ruby", "Terraform", "Kotlin", "Go", 
+    "CoffeeScript", "JSP", "Objective C", "PHP", "Dart", "Perl", "LESS", 
+    "Groovy", "Lua", "Scala", "VisualForce", "Velocity", "Lisp", "VisualBasic"
+)
+
+# Encoded '"languages":[...]}' tail of the create coding standard payload
+LANGUAGES_JSON_TAIL = orjson.dumps({"languages": ALL_LANGUAGES})[1:]
+
+# How long the tool catalog is reused from the on-disk cache, in seconds
+TOOLS_CACHE_TTL = 86400
+
 class CodacyAPI:
     """Client for interacting with the Codacy API."""
     
-    def __init__(self):
-        """Initialize the Codacy API client."""
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[DiskCache] = None
+    ):
+        """
+        Initialize the Codacy API client.
+
+        Args:
+            client: Optional httpx client to share between API clients.
+                An HTTP/2 client is created lazily on first use if not provided.
+            cache: Optional on-disk cache for rarely changing responses
+        """
+        self.client = client
+        self.cache = cache if cache is not None else DiskCache()
+        self.limiter = RateLimiter()
+        self._available_tools: Optional[List[Dict]] = None
+        # ETag and response body of conditional GET requests, keyed by URL
+        self._etags: Dict[str, Tuple[str, Dict]] = {}
         self.base_url = settings.api_url.rstrip('/')
         authority = self.base_url.replace('https://', '').replace('http://', '')
         self.headers = {
@@ -23,52 +74,189 @@ class CodacyAPI:
         }
         self.provider = settings.provider
         self.org_name = settings.org_name
+        
+        # Endpoint URLs are built once instead of on every request
+        self._tools_url = f"{self.base_url}/api/v3/tools"
+        self._standards_url = (
+            f"{self.base_url}/api/v3/organizations/{self.provider}/{self.org_name}/coding-standards"
+        )
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Get the HTTP client, creating it on first use.
+        
+        The client speaks HTTP/2, so concurrent requests are multiplexed over
+        a single connection instead of opening one connection each. Redirects
+        are followed, as they were with the previous HTTP libraries.
+
+        Returns:
+            Shared httpx client
+        """
+        if self.client is None or self.client.is_closed:
+            self.client = httpx.AsyncClient(
+                http2=True,
+                follow_redirects=True,
+                timeout=httpx.Timeout(60.0, connect=5.0),
+                limits=httpx.Limits(
+                    max_connections=POOL_SIZE,
+                    max_keepalive_connections=POOL_SIZE,
+                    keepalive_expiry=75
+                )
+            )
+        return self.client
+
+    async def close(self) -> None:
+        """Close the underlying HTTP client and release pooled connections."""
+        if self.client is not None and not self.client.is_closed:
+            await self.client.aclose()
+
+    async def __aenter__(self) -> "CodacyAPI":
+        """Open the client for use as an async context manager."""
+        self._get_client()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Close the client when leaving the context."""
+        await self.close()
+
+    @staticmethod
+    def _retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+        """
+        Get the delay requested by the server through the Retry-After header.
+        
+        Args:
+            headers: HTTP response headers
+            
+        Returns:
+            Delay in seconds, or None if the header is missing or not numeric
+        """
+        try:
+            return float(headers['Retry-After'])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _should_retry(method: str, status: int) -> bool:
+        """
+        Check whether a failed request can safely be retried.
+        
+        POST requests create or change state on the server, so they are only
+        retried when the server rejected them outright with a 429.
+        
+        Args:
+            method: HTTP method of the request
+            status: HTTP status code of the failed response
+            
+        Returns:
+            True if the request should be retried
+        """
+        if method.upper() == 'POST':
+            return status == 429
+        return status in RETRYABLE_STATUSES
+
+    def _backoff_delay(
+        self,
+        attempt: int,
+        headers: Optional[Mapping[str, str]]
+    ) -> float:
+        """
+        Compute how long to wait before retrying a request.
+        
+        Args:
+            attempt: Zero-based number of the failed attempt
+            headers: Headers of the failed response
+            
+        Returns:
+            Delay in seconds
+        """
+        delay = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)
+        delay *= 1 + random.uniform(0, BACKOFF_JITTER)
+        return max(delay, self._retry_after(headers) or 0)
 
-    def _make_request(
+    async def _make_request(
         self, 
         method: str, 
-        endpoint: str, 
+        url: str, 
         json: Dict = None,
-        data: str = None,
-        params: Dict = None
+        data: Union[str, bytes] = None,
+        params: Dict = None,
+        conditional: bool = False
     ) -> Dict:
         """
         Make an HTTP request to the Codacy API.
         
         Args:
             method: HTTP method (GET, POST, PUT, PATCH etc.)
-            endpoint: API endpoint
-            json: Optional JSON payload (for structured data)
-            data: Optional string payload (for raw data)
+            url: Absolute URL of the API endpoint
+            json: Optional JSON payload (for structured data), encoded with orjson
+            data: Optional string or bytes payload (for raw or pre-encoded data)
             params: Optional query parameters
+            conditional: Whether to revalidate a previous response for the
+                same URL with If-None-Match instead of downloading it again
             
         Returns:
             API response as dictionary
             
         Raises:
-            requests.exceptions.RequestException: If the API request fails
+            httpx.HTTPError: If the API request fails
         """
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        logger.debug(f"Making {method} request to {url}")
+        logger.debug("Making %s request to %s", method, url)
         
-        try:
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=self.headers,
-                json=json,
-                data=data,
-                params=params
-            )
-            response.raise_for_status()
-            return response.json() if response.text else {}
-        except requests.exceptions.RequestException as e:
-            logger.error(f"API request failed: {str(e)}")
-            if hasattr(e.response, 'json'):
-                logger.error(f"Response: {e.response.json()}")
-            raise
+        if json is not None:
+            data = orjson.dumps(json)
+        
+        headers = self.headers
+        cached = self._etags.get(url) if conditional else None
+        if cached is not None:
+            headers = {**self.headers, 'If-None-Match': cached[0]}
+        
+        for attempt in range(MAX_RETRIES + 1):
+            await self.limiter.acquire()
+            try:
+                response = await self._get_client().request(
+                    method,
+                    url,
+                    headers=headers,
+                    content=data,
+                    params=params
+                )
+                if response.status_code == 429:
+                    self.limiter.decrease(self._retry_after(response.headers))
+                elif response.status_code < 400:
+                    self.limiter.increase()
+                if response.status_code == 304 and cached is not None:
+                    logger.debug("Response for %s not modified", url)
+                    return cached[1]
+                response.raise_for_status()
+                result = orjson.loads(response.content) if response.content else {}
+                etag = response.headers.get('ETag')
+                if conditional and etag:
+                    self._etags[url] = (etag, result)
+                return result
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                if attempt < MAX_RETRIES and self._should_retry(method, status):
+                    delay = self._backoff_delay(attempt, e.response.headers)
+                    logger.warning(
+                        "%s request to %s failed with status %d, retrying in %.1fs (%d/%d)",
+                        method,
+                        url,
+                        status,
+                        delay,
+                        attempt + 1,
+                        MAX_RETRIES
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                logger.error("API request failed: %s", e)
+                # Log the raw body; it may not be JSON, and parsing it is not needed
+                logger.error("Response %d: %s", status, e.response.text[:MAX_LOGGED_BODY])
+                raise
+            except httpx.HTTPError as e:
+                logger.error("API request failed: %s", e)
+                raise
 
-    def create_coding_standard(self, name: str) -> Dict:
+    async def create_coding_standard(self, name: str) -> Dict:
         """
         Create a new coding standard.
         
@@ -78,42 +266,56 @@ class CodacyAPI:
         Returns:
             Created coding standard details
         """
-        endpoint = f"api/v3/organizations/{self.provider}/{self.org_name}/coding-standards"
-        data = {
-            "name": name,
-            "languages": [
-                "Markdown", "YAML", "JSON", "Python", "Dockerfile", "Shell", "XML", 
-                "Javascript", "HTML", "CSS", "Java", "C", "CPP", "TypeScript", "Powershell", 
-                "CSharp", "SQL", "SASS", "Swift", "Ruby", "Terraform", "Kotlin", "Go", 
-                "CoffeeScript", "JSP", "Objective C", "PHP", "Dart", "Perl", "LESS", 
-                "Groovy", "Lua", "Scala", "VisualForce", "Velocity", "Lisp", "VisualBasic"
-            ]
-        }
-        return self._make_request("POST", endpoint, json=data)
+        data = b'{"name":' + orjson.dumps(name) + b',' + LANGUAGES_JSON_TAIL
+        return await self._make_request("POST", self._standards_url, data=data)
 
-    def get_coding_standards(self) -> List[Dict]:
+    async def get_coding_standards(self) -> List[Dict]:
         """
         Get list of coding standards.
         
         Returns:
             List of coding standards
         """
-        endpoint = f"api/v3/organizations/{self.provider}/{self.org_name}/coding-standards"
-        response = self._make_request("GET", endpoint)
+        response = await self._make_request("GET", self._standards_url, conditional=True)
         return response.get('data', [])
 
-    def get_available_tools(self) -> List[Dict]:
+    async def get_available_tools(self, refresh: bool = False) -> List[Dict]:
         """
         Get list of all available tools.
         
+        The tool catalog rarely changes, so it is kept for the lifetime of the
+        client and reused from the on-disk cache for TOOLS_CACHE_TTL seconds.
+        Once the cached copy expires, it is revalidated with its ETag.
+        
+        Args:
+            refresh: Whether to bypass the caches and fetch the catalog again
+            
         Returns:
             List of tools
         """
-        endpoint = "api/v3/tools"
-        response = self._make_request("GET", endpoint)
-        return response.get('data', [])
+        if self._available_tools is not None and not refresh:
+            return self._available_tools
+        
+        entry = None if refresh else self.cache.get(self._tools_url, TOOLS_CACHE_TTL)
+        if isinstance(entry, dict):
+            logger.debug("Using cached tool catalog")
+            tools = entry.get('data', [])
+        else:
+            # Revalidate an expired entry instead of downloading it again
+            stale = self.cache.get(self._tools_url, math.inf)
+            if isinstance(stale, dict) and stale.get('etag'):
+                self._etags[self._tools_url] = (stale['etag'], {'data': stale.get('data', [])})
+            
+            response = await self._make_request("GET", self._tools_url, conditional=True)
+            tools = response.get('data', [])
+            if tools:
+                etag = self._etags.get(self._tools_url, (None,))[0]
+                self.cache.set(self._tools_url, {'etag': etag, 'data': tools})
+        
+        self._available_tools = tools
+        return tools
 
-    def enable_tool(self, coding_standard_id: str, tool_uuid: str) -> Dict:
+    async def enable_tool(self, coding_standard_id: str, tool_uuid: str) -> Dict:
         """
         Enable a tool in the coding standard.
         
@@ -124,53 +326,84 @@ class CodacyAPI:
         Returns:
             Updated tool configuration
         """
-        endpoint = f"api/v3/organizations/{self.provider}/{self.org_name}/coding-standards/{coding_standard_id}/tools/{tool_uuid}"
+        url = f"{self._standards_url}/{coding_standard_id}/tools/{tool_uuid}"
         data = {
             "enabled": True,
             "patterns": []
         }
-        response = self._make_request("PATCH", endpoint, json=data)
-        time.sleep(2)  # Rate limiting precaution
-        return response
+        return await self._make_request("PATCH", url, json=data)
 
-    def get_patterns(
+    async def iter_pattern_pages(
         self,
         coding_standard_id: str,
         tool_uuid: str,
         limit: int = 100
-    ) -> List[Dict]:
+    ) -> AsyncIterator[List[Dict]]:
         """
-        Get patterns for a specific tool.
+        Iterate over the pages of patterns for a specific tool.
+        
+        Pagination is cursor based, so pages cannot be fetched in parallel.
+        Instead, the request for the next page is started as soon as its
+        cursor is known, and runs while the caller processes the current page.
         
         Args:
             coding_standard_id: ID of the coding standard
             tool_uuid: UUID of the tool
             limit: Number of patterns to fetch per page
             
-        Returns:
-            List of patterns
+        Yields:
+            Lists of patterns, one per page
         """
-        patterns = []
-        cursor = ''
-        has_next_page = True
+        url = f"{self._standards_url}/{coding_standard_id}/tools/{tool_uuid}/patterns"
         
-        while has_next_page:
-            endpoint = f"api/v3/organizations/{self.provider}/{self.org_name}/coding-standards/{coding_standard_id}/tools/{tool_uuid}/patterns"
+        def fetch_page(cursor: str) -> "asyncio.Task[Dict]":
             params = {'limit': limit}
             if cursor:
                 params['cursor'] = cursor
+            return asyncio.ensure_future(
+                self._make_request("GET", url, params=params)
+            )
+        
+        next_page = fetch_page('')
+        try:
+            while next_page is not None:
+                response = await next_page
                 
-            response = self._make_request("GET", endpoint, params=params)
-            patterns.extend(response.get('data', []))
-            
-            pagination = response.get('pagination', {})
-            has_next_page = 'cursor' in pagination
-            if has_next_page:
-                cursor = pagination['cursor']
+                pagination = response.get('pagination', {})
+                if 'cursor' in pagination:
+                    next_page = fetch_page(pagination['cursor'])
+                else:
+                    next_page = None
+                
+                yield response.get('data', [])
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    async def iter_patterns(
+        self,
+        coding_standard_id: str,
+        tool_uuid: str,
+        limit: int = 100
+    ) -> AsyncIterator[Dict]:
+        """
+        Iterate over the patterns for a specific tool, one at a time.
         
-        return patterns
+        Args:
+            coding_standard_id: ID of the coding standard
+            tool_uuid: UUID of the tool
+            limit: Number of patterns to fetch per page
+            
+        Yields:
+            Pattern details
+        """
+        pages = self.iter_pattern_pages(coding_standard_id, tool_uuid, limit)
+        async with aclosing(pages):
+            async for page in pages:
+                for pattern in page:
+                    yield pattern
 
-    def update_patterns(
+    async def update_patterns(
         self,
         coding_standard_id: str,
         tool_uuid: str,
@@ -187,16 +420,14 @@ class CodacyAPI:
         Returns:
             Updated tool configuration
         """
-        endpoint = f"api/v3/organizations/{self.provider}/{self.org_name}/coding-standards/{coding_standard_id}/tools/{tool_uuid}"
+        url = f"{self._standards_url}/{coding_standard_id}/tools/{tool_uuid}"
         data = {
             "enabled": True,
             "patterns": patterns
         }
-        response = self._make_request("PATCH", endpoint, json=data)
-        time.sleep(2)  # Rate limiting precaution
-        return response
+        return await self._make_request("PATCH", url, json=data)
 
-    def promote_draft(self, coding_standard_id: str) -> Dict:
+    async def promote_draft(self, coding_standard_id: str) -> Dict:
         """
         Promote a draft coding standard.
         
@@ -206,10 +437,10 @@ class CodacyAPI:
         Returns:
             Response data
         """
-        endpoint = f"api/v3/organizations/{self.provider}/{self.org_name}/coding-standards/{coding_standard_id}/promote"
-        return self._make_request("POST", endpoint)
+        url = f"{self._standards_url}/{coding_standard_id}/promote"
+        return await self._make_request("POST", url)
 
-    def set_default(self, coding_standard_id: str) -> Dict:
+    async def set_default(self, coding_standard_id: str) -> Dict:
         """
         Set a coding standard as default.
         
@@ -219,6 +450,6 @@ class CodacyAPI:
         Returns:
             Response data
         """
-        endpoint = f"api/v3/organizations/{self.provider}/{self.org_name}/coding-standards/{coding_standard_id}/setDefault"
+        url = f"{self._standards_url}/{coding_standard_id}/setDefault"
         data = {"isDefault": True}
-        return self._make_request("POST", endpoint, json=data)
+        return await self._make_request("POST", url, json=data)
@@ -1,56 +1,74 @@
 """Configuration settings for the Codacy coding standard generator."""
 import os
+from dataclasses import dataclass, field
+from typing import Mapping
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# Marker set once the .env file has been loaded into the environment
+DOTENV_LOADED_VAR = "_DOTENV_LOADED"
 
+# Load environment variables from .env file, once per process tree
+if not os.environ.get(DOTENV_LOADED_VAR):
+    load_dotenv()
+    os.environ[DOTENV_LOADED_VAR] = "1"
+
+DEFAULT_API_URL = "https://app.codacy.com"
+DEFAULT_LOG_LEVEL = "INFO"
+
+@dataclass(frozen=True, slots=True)
 class Settings:
     """Application settings loaded from environment variables."""
     
-    def __init__(self):
-        """Initialize settings from environment variables."""
-        self.api_token: str = self._get_required_env("CODACY_API_TOKEN")
-        self.org_name: str = self._get_required_env("CODACY_ORG_NAME")
-        self.provider: str = self._get_required_env("CODACY_PROVIDER")
-        self.api_url: str = self._get_optional_env(
-            "CODACY_API_URL", 
-            "https://app.codacy.com"
-        )
-        self.log_level: str = self._get_optional_env("LOG_LEVEL", "INFO")
+    api_token: str = field(repr=False)
+    org_name: str
+    provider: str
+    api_url: str = DEFAULT_API_URL
+    log_level: str = DEFAULT_LOG_LEVEL
 
-    @staticmethod
-    def _get_required_env(key: str) -> str:
+    @classmethod
+    def from_env(cls, env: Mapping[str, str] = os.environ) -> "Settings":
         """
-        Get a required environment variable.
+        Create settings from environment variables.
         
         Args:
-            key: The environment variable key.
+            env: Mapping to read the variables from, os.environ by default.
             
         Returns:
-            The environment variable value.
+            Settings instance.
             
         Raises:
-            ValueError: If the environment variable is not set.
+            ValueError: If a required environment variable is not set.
         """
-        value = os.getenv(key)
-        if not value:
-            raise ValueError(f"Required environment variable '{key}' is not set")
-        return value
+        return cls(
+            api_token=cls._get_required_env(env, "CODACY_API_TOKEN"),
+            org_name=cls._get_required_env(env, "CODACY_ORG_NAME"),
+            provider=cls._get_required_env(env, "CODACY_PROVIDER"),
+            api_url=env.get("CODACY_API_URL", DEFAULT_API_URL),
+            log_level=env.get("LOG_LEVEL", DEFAULT_LOG_LEVEL)
+        )
 
     @staticmethod
-    def _get_optional_env(key: str, default: str) -> str:
+    def _get_required_env(env: Mapping[str, str], key: str) -> str:
         """
-        Get an optional environment variable with a default value.
+        Get a required environment variable.
         
         Args:
+            env: Mapping to read the variable from.
             key: The environment variable key.
-            default: The default value if the environment variable is not set.
             
         Returns:
-            The environment variable value or the default value.
+            The environment variable value.
+            
+        Raises:
+            ValueError: If the environment variable is not set.
         """
-        return os.getenv(key, default)
+        try:
+            value = env[key]
+        except KeyError:
+            value = ""
+        if not value:
+            raise ValueError(f"Required environment variable '{key}' is not set")
+        return value
 
 # Create a global settings instance
-settings = Settings()
+settings = Settings.from_env()
@@ -1,58 +1,142 @@
 """Main script for creating a Codacy coding standard."""
+import asyncio
 import sys
 import click
+from contextlib import aclosing
 from typing import Optional
 from src.api.codacy import CodacyAPI
 from src.utils.logger import setup_logger
 
-def process_patterns(
+# Maximum number of tools processed concurrently
+MAX_CONCURRENT_TOOLS = 20
+
+# Maximum number of patterns sent in a single update request
+PATTERN_BATCH_SIZE = 500
+
+# Severity levels (lowercase) of the patterns that get disabled
+MINOR_SEVERITIES = frozenset({'info', 'minor'})
+
+async def process_patterns(
     api: CodacyAPI,
     logger: any,
     standard_id: str,
     tool_uuid: str,
     dry_run: bool
-) -> None:
+) -> int:
     """
     Process patterns for a tool, disabling minor findings.
     
+    Every pattern update also enables the tool, so callers only need to
+    enable the tool separately when no update was sent or processing failed.
+    
     Args:
         api: CodacyAPI instance
         logger: Logger instance
         standard_id: Coding standard ID
         tool_uuid: Tool UUID
         dry_run: Whether to run in dry-run mode
+        
+    Returns:
+        Number of pattern update requests sent
     """
-    patterns = api.get_patterns(standard_id, tool_uuid)
-    patterns_to_update = []
+    batch = []
+    updates = 0
     
-    for pattern in patterns:
-        pattern_def = pattern.get('patternDefinition', {})
-        pattern_id = pattern_def.get('id')
-        severity = pattern_def.get('severityLevel', '').lower()
+    patterns = api.iter_patterns(standard_id, tool_uuid)
+    # Close the stream right away on errors so no prefetched request lingers
+    async with aclosing(patterns):
+        async for pattern in patterns:
+            try:
+                pattern_def = pattern['patternDefinition']
+                severity = pattern_def['severityLevel']
+                if not severity or severity.lower() not in MINOR_SEVERITIES:
+                    continue
+                pattern_id = pattern_def['id']
+            except KeyError:
+                # Patterns with incomplete definitions are left untouched
+                continue
         
-        if severity in ['info', 'minor']:
-            patterns_to_update.append({
-                'id': pattern_id,
-                'enabled': False
-            })
             if dry_run:
                 logger.info(
-                    f"[DRY RUN] Would disable pattern: {pattern_id} "
-                    f"({severity})"
+                    "[DRY RUN] Would disable pattern: %s (%s)",
+                    pattern_id,
+                    severity.lower()
                 )
+                continue
+        
+            batch.append({
+                'id': pattern_id,
+                'enabled': False
+            })
+            # Send each full batch right away to keep memory bounded
+            if len(batch) == PATTERN_BATCH_SIZE:
+                await api.update_patterns(standard_id, tool_uuid, batch)
+                logger.info("Disabled %d minor patterns", len(batch))
+                updates += 1
+                batch = []
+    
+    if batch:
+        await api.update_patterns(standard_id, tool_uuid, batch)
+        logger.info("Disabled %d minor patterns", len(batch))
+        updates += 1
     
-    if patterns_to_update and not dry_run:
-        # Update patterns in batches of 500 to avoid request size limits
-        for i in range(0, len(patterns_to_update), 500):
-            batch = patterns_to_update[i:i + 500]
-            api.update_patterns(standard_id, tool_uuid, batch)
-            logger.info(f"Disabled {len(batch)} minor patterns")
+    return updates
 
-def create_standard(
+async def process_tool(
+    api: CodacyAPI,
+    logger: any,
+    standard_id: str,
+    tool: dict,
+    dry_run: bool
+) -> None:
+    """
+    Enable a tool and disable its minor patterns.
+    
+    Args:
+        api: CodacyAPI instance
+        logger: Logger instance
+        standard_id: Coding standard ID
+        tool: Tool details as returned by the API
+        dry_run: Whether to run in dry-run mode
+    """
+    tool_uuid = tool.get('uuid')
+    tool_name = tool.get('name')
+    
+    if not tool_uuid or not tool_name:
+        logger.warning("Skipping tool with incomplete data: %s", tool)
+        return
+    
+    try:
+        logger.info("Processing tool: %s", tool_name)
+        
+        if dry_run:
+            logger.info("[DRY RUN] Would enable tool: %s", tool_name)
+        
+        # Process patterns, which also enables the tool when updates are sent
+        try:
+            updates = await process_patterns(api, logger, standard_id, tool_uuid, dry_run)
+        except Exception:
+            # The tool must stay enabled even if its patterns could not be
+            # listed or updated, as it was before patterns were processed
+            if not dry_run:
+                await api.enable_tool(standard_id, tool_uuid)
+                logger.info("Enabled tool: %s", tool_name)
+            raise
+        
+        if not dry_run:
+            if not updates:
+                await api.enable_tool(standard_id, tool_uuid)
+            logger.info("Enabled tool: %s", tool_name)
+            
+    except Exception as e:
+        logger.error("Error processing tool %s: %s", tool_name, e)
+
+async def create_standard(
     project_name: str,
     dry_run: bool = False,
     verbose: bool = False,
-    output: Optional[str] = None
+    output: Optional[str] = None,
+    set_as_default: bool = True
 ) -> None:
     """
     Create a new coding standard with all languages and tools enabled,
@@ -63,71 +147,85 @@ def create_standard(
         dry_run: Whether to preview changes without applying them
         verbose: Whether to enable verbose logging
         output: Optional custom log file path
+        set_as_default: Whether to make the new standard the default one
     """
-    logger = setup_logger(output, verbose)
-    api = CodacyAPI()
+    logger, listener = setup_logger(output, verbose)
     
-    try:
-        # Create new coding standard
-        logger.info(f"Creating new coding standard: {project_name}")
-        if dry_run:
-            logger.info("[DRY RUN] Would create new coding standard")
-            standard_id = "dry-run-id"
-        else:
-            response = api.create_coding_standard(project_name)
-            standard_id = response.get("data", {}).get("id")
-            if not standard_id:
-                raise ValueError("Failed to get coding standard ID from response")
-            logger.info(f"Created coding standard with ID: {standard_id}")
+    async with CodacyAPI() as api:
+        try:
+            # Create new coding standard
+            logger.info("Creating new coding standard: %s", project_name)
+            if dry_run:
+                logger.info("[DRY RUN] Would create new coding standard")
+                standard_id = "dry-run-id"
+            else:
+                response = await api.create_coding_standard(project_name)
+                standard_id = response.get("data", {}).get("id")
+                if not standard_id:
+                    raise ValueError("Failed to get coding standard ID from response")
+                logger.info("Created coding standard with ID: %s", standard_id)
 
-        # Get and enable all tools
-        logger.info("Fetching available tools...")
-        tools = api.get_available_tools()
+            # Get and enable all tools
+            logger.info("Fetching available tools...")
+            tools = await api.get_available_tools()
         
-        if not tools:
-            logger.warning("No tools found")
-            return
-            
-        for tool in tools:
-            try:
-                tool_uuid = tool.get('uuid')
-                tool_name = tool.get('name')
-                
-                if not tool_uuid or not tool_name:
-                    logger.warning(f"Skipping tool with incomplete data: {tool}")
-                    continue
-                    
-                logger.info(f"Processing tool: {tool_name}")
-                
-                if not dry_run:
-                    # Enable the tool
-                    api.enable_tool(standard_id, tool_uuid)
-                    logger.info(f"Enabled tool: {tool_name}")
-                    
-                    # Process patterns
-                    process_patterns(api, logger, standard_id, tool_uuid, dry_run)
-                else:
-                    logger.info(f"[DRY RUN] Would enable tool: {tool_name}")
-                    process_patterns(api, logger, standard_id, tool_uuid, dry_run)
-                    
-            except Exception as e:
-                logger.error(f"Error processing tool {tool_name}: {str(e)}")
-                continue
+            if not tools:
+                logger.warning("No tools found")
+                return
+        
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_TOOLS)
+        
+            async def process_tool_bounded(tool: dict) -> None:
+                async with semaphore:
+                    await process_tool(api, logger, standard_id, tool, dry_run)
+        
+            await asyncio.gather(*(process_tool_bounded(tool) for tool in tools))
 
-        if not dry_run:
-            # Promote the coding standard
-            logger.info("Promoting coding standard...")
-            api.promote_draft(standard_id)
+            if not dry_run:
+                # Promote the coding standard
+                logger.info("Promoting coding standard...")
+                await api.promote_draft(standard_id)
             
-            # Set as default
-            logger.info("Setting as default coding standard...")
-            api.set_default(standard_id)
+                # Only a promoted standard can become the default, so this
+                # cannot run concurrently with the promotion
+                if set_as_default:
+                    logger.info("Setting as default coding standard...")
+                    await api.set_default(standard_id)
 
-        logger.info("Successfully created and configured coding standard")
+            logger.info("Successfully created and configured coding standard")
         
-    except Exception as e:
-        logger.error(f"Failed to create coding standard: {str(e)}")
-        sys.exit(1)
+        except Exception as e:
+            logger.error("Failed to create coding standard: %s", e)
+            sys.exit(1)
+        finally:
+            listener.stop()
+
+async def set_default_standard(
+    standard_id: str,
+    verbose: bool = False,
+    output: Optional[str] = None
+) -> None:
+    """
+    Set an existing coding standard as the organization default.
+    
+    Args:
+        standard_id: ID of the coding standard
+        verbose: Whether to enable verbose logging
+        output: Optional custom log file path
+    """
+    logger, listener = setup_logger(output, verbose)
+    
+    async with CodacyAPI() as api:
+        try:
+            logger.info("Setting coding standard %s as default...", standard_id)
+            await api.set_default(standard_id)
+            logger.info("Successfully set default coding standard")
+        
+        except Exception as e:
+            logger.error("Failed to set default coding standard: %s", e)
+            sys.exit(1)
+        finally:
+            listener.stop()
 
 @click.group()
 def cli():
@@ -155,14 +253,46 @@ def cli():
     type=str,
     help="Custom log file path"
 )
+@click.option(
+    "--skip-default",
+    is_flag=True,
+    help="Do not set the new coding standard as default"
+)
 def create(
     project_name: str,
     dry_run: bool,
     verbose: bool,
-    output: Optional[str]
+    output: Optional[str],
+    skip_default: bool
 ) -> None:
     """Create a Codacy coding standard with all languages and tools enabled."""
-    create_standard(project_name, dry_run, verbose, output)
+    asyncio.run(
+        create_standard(project_name, dry_run, verbose, output, not skip_default)
+    )
+
+@cli.command("set-default")
+@click.option(
+    "--standard-id",
+    required=True,
+    help="ID of the coding standard to set as default"
+)
+@click.option(
+    "--verbose",
+    is_flag=True,
+    help="Enable verbose logging"
+)
+@click.option(
+    "--output",
+    type=str,
+    help="Custom log file path"
+)
+def set_default(
+    standard_id: str,
+    verbose: bool,
+    output: Optional[str]
+) -> None:
+    """Set an existing Codacy coding standard as the default."""
+    asyncio.run(set_default_standard(standard_id, verbose, output))
 
 if __name__ == "__main__":
     cli()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,77 @@
+"""On-disk cache for API responses that rarely change."""
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Optional
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+# Default location of the cache, shared between runs
+CACHE_DIR = Path.home() / ".cache" / "codacy"
+
+class DiskCache:
+    """Store JSON-serializable values on disk with a time-to-live."""
+
+    def __init__(self, cache_dir: Path = CACHE_DIR):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory where cache entries are stored
+        """
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, key: str) -> Path:
+        """
+        Get the file path for a cache key.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Path of the cache entry
+        """
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def get(self, key: str, max_age: float) -> Optional[Any]:
+        """
+        Get a cached value if it is younger than max_age.
+
+        Args:
+            key: Cache key
+            max_age: Maximum age of the entry in seconds
+
+        Returns:
+            Cached value, or None if missing, expired or unreadable
+        """
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > max_age:
+                return None
+            with path.open(encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a value in the cache.
+
+        Failures are logged and ignored, as the cache is only an optimization.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+        """
+        path = self._path(key)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump(value, f)
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.debug("Could not write cache entry %s: %s", path, e)
@@ -1,21 +1,35 @@
 """Logging configuration for the Codacy coding standard generator."""
 import logging
 import os
+import queue
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Tuple
 from rich.logging import RichHandler
 from src.config.settings import settings
 
-def setup_logger(output_path: str = None, verbose: bool = False) -> logging.Logger:
+# Size limits for the rotating log file
+LOG_FILE_MAX_BYTES = 10 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 5
+
+def setup_logger(
+    output_path: str = None,
+    verbose: bool = False
+) -> Tuple[logging.Logger, QueueListener]:
     """
     Configure and return a logger instance.
     
+    The logger only puts records on a queue; a background listener thread
+    writes them to the console and the log file, so logging calls never
+    block on I/O. Stop the listener when done to flush pending records.
+    
     Args:
         output_path: Optional custom path for the log file.
         verbose: Whether to enable debug logging.
         
     Returns:
-        Configured logger instance.
+        Configured logger instance and the started queue listener.
     """
     # Create logger
     logger = logging.getLogger("codacy_standard")
@@ -31,7 +45,6 @@ def setup_logger(output_path: str = None, verbose: bool = False) -> logging.Logg
     console_handler = RichHandler(rich_tracebacks=True)
     console_handler.setFormatter(console_formatter)
     console_handler.setLevel(logging.DEBUG if verbose else getattr(logging, settings.log_level))
-    logger.addHandler(console_handler)
 
     # File handler
     if not output_path:
@@ -39,12 +52,27 @@ def setup_logger(output_path: str = None, verbose: bool = False) -> logging.Logg
         log_dir.mkdir(exist_ok=True)
         output_path = log_dir / f"codacy_standard_{datetime.now().strftime('%Y-%m-%d')}.log"
 
-    file_handler = logging.FileHandler(output_path)
+    file_handler = RotatingFileHandler(
+        output_path,
+        maxBytes=LOG_FILE_MAX_BYTES,
+        backupCount=LOG_FILE_BACKUP_COUNT,
+        delay=True
+    )
     file_handler.setFormatter(file_formatter)
     file_handler.setLevel(logging.DEBUG)  # Always log everything to file
-    logger.addHandler(file_handler)
 
-    return logger
+    # Hand records to the handlers on a background thread
+    log_queue = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(
+        log_queue,
+        console_handler,
+        file_handler,
+        respect_handler_level=True
+    )
+    listener.start()
+
+    return logger, listener
 
 def get_logger() -> logging.Logger:
     """
@@ -0,0 +1,94 @@
+"""Adaptive token bucket rate limiter for API requests."""
+import asyncio
+import time
+from typing import Optional
+
+class RateLimiter:
+    """
+    Token bucket whose refill rate adapts to server backpressure.
+
+    Requests run at full speed while the API accepts them. Each successful
+    response nudges the rate up additively; a burst of 429 responses cuts it
+    multiplicatively once and, when the server sends a Retry-After delay, pauses
+    the bucket until that delay has elapsed.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        capacity: float = 10.0,
+        min_rate: float = 0.5,
+        max_rate: float = 20.0,
+        increase_step: float = 0.5,
+        decrease_factor: float = 0.5
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rate: Initial refill rate in requests per second
+            capacity: Maximum number of tokens (burst size)
+            min_rate: Lower bound for the refill rate
+            max_rate: Upper bound for the refill rate
+            increase_step: Rate added after each successful request
+            decrease_factor: Factor applied to the rate on a 429 response
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        # End of the current backoff window; further 429s within it belong to
+        # the same burst and do not lower the rate again
+        self._decrease_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add the tokens accumulated since the last refill."""
+        now = time.monotonic()
+        elapsed = max(0.0, now - self.last_refill)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.last_refill = max(self.last_refill, now)
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and consume it."""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1 and time.monotonic() >= self.last_refill:
+                    self.tokens -= 1
+                    return
+                wait = max(
+                    self.last_refill - time.monotonic(),
+                    (1 - self.tokens) / self.rate
+                )
+                await asyncio.sleep(max(0.0, wait))
+
+    def increase(self) -> None:
+        """Raise the rate after a successful request."""
+        self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def decrease(self, retry_after: Optional[float] = None) -> None:
+        """
+        Lower the rate after the server signalled backpressure.
+
+        Concurrent requests that were already in flight tend to fail together,
+        so the rate is lowered at most once per backoff window. The window
+        lasts one refill interval at the lowered rate, or until the end of
+        the Retry-After delay if that is later.
+
+        Args:
+            retry_after: Optional delay in seconds requested by the server
+        """
+        now = time.monotonic()
+        self.tokens = min(self.tokens, 0.0)
+        if retry_after:
+            # Defer the next refill until the server-requested delay is over
+            self.last_refill = max(self.last_refill, now + retry_after)
+        if now < self._decrease_until:
+            return
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        self._decrease_until = max(now + 1 / self.rate, self.last_refill)